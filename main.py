@@ -1,5 +1,10 @@
+import os
+import queue
+import threading
 import tkinter as tk
+from tkinter import messagebox
 from tkinter import ttk
+import openpyxl
 
 root = tk.Tk()
 
@@ -50,6 +55,60 @@ checkbutton = ttk.Checkbutton(widgets_frame, text="Employed", variable=cb)
 checkbutton.grid(row=3, column=0, padx=5, pady=(0,5), sticky="nsew")
 
 ### col1, row5 ### Insert Row button
+# the workbook is loaded once and kept in memory. Saving is delayed a little
+# so that several quick inserts end up as a single workbook.save() call
+# the same file is shown in the treeView and written to by insert_row
+# used prefix (r) to avoid unicodeescape error
+# see https://stackoverflow.com/questions/1347791/unicode-error-unicodeescape-codec-cant-decode-bytes-cannot-open-text-file
+# xl_path = r"C:\Users\Administrator\Desktop\Github\xl_tkinter\people.xlsx" # windows
+xl_path = r"./people.xlsx" # linux
+SAVE_DELAY_MS = 500
+workbook = None
+workbook_mtime = None # modification time of the file when it was loaded/saved by the app
+pending_rows = [] # rows inserted since the last save, only cleared once the file was really written
+save_pending_id = None
+
+def get_workbook():
+    global workbook, workbook_mtime
+    if workbook is None:
+        workbook_mtime = os.path.getmtime(xl_path)
+        workbook = openpyxl.load_workbook(xl_path)
+        # rows that are not saved yet go on top of the freshly read file
+        for row in pending_rows:
+            workbook.active.append(row)
+    return workbook
+
+def write_workbook():
+    # raises if the file can't be written, leaving pending_rows as they are
+    global workbook, workbook_mtime
+    if os.path.getmtime(xl_path) != workbook_mtime:
+        # the file was changed outside the app (e.g. saved from Excel) since it was
+        # loaded: read it again so those edits are not overwritten by our copy
+        workbook = None
+    get_workbook().save(xl_path)
+    workbook_mtime = os.path.getmtime(xl_path)
+    pending_rows.clear()
+
+def excel_error_text(action, e):
+    # shared wording for the error dialogs about reading/writing the excel file
+    return f"Could not {action} the excel file:\n{e}\n\n"
+
+def save_workbook():
+    global save_pending_id
+    save_pending_id = None
+    try:
+        write_workbook()
+    except Exception as e: # e.g. PermissionError while the file is open in Excel
+        messagebox.showerror("Save failed", excel_error_text("save", e) +
+            "The new rows are kept and will be saved again on the next insert or when closing.")
+
+def request_save():
+    # cancel the save that is still waiting and schedule a new one
+    global save_pending_id
+    if save_pending_id:
+        root.after_cancel(save_pending_id)
+    save_pending_id = root.after(SAVE_DELAY_MS, save_workbook)
+
 def insert_row():
     '''
      This function is the one where user input will be added to the excel file
@@ -65,12 +124,16 @@ def insert_row():
     print(name, age, subscription_status, employment_status)
 
     # inserting the row to the excel file
-    path = r"C:\Users\Administrator\Desktop\Github\xl_tkinter\people.xlsx"
-    workbook = openpyxl.load_workbook(path)
-    sheet = workbook.active
+    try:
+        sheet = get_workbook().active
+    except Exception as e: # e.g. the file was moved or is not a valid excel file
+        messagebox.showerror("Insert failed", excel_error_text("open", e) +
+            "The row was not inserted.")
+        return
     row_values = [name, age, subscription_status, employment_status]
     sheet.append(row_values)
-    workbook.save(path)
+    pending_rows.append(row_values)
+    request_save()
 
     # displaying the inserted row on the UI (treeView)
     treeView.insert('', tk.END, values=row_values)
@@ -86,7 +149,8 @@ def insert_row():
     checkbutton.state(["!selected"])
 
 
-button = ttk.Button(widgets_frame, text="Insert", command=insert_row)
+# fixed width (same as the entry fields) so the loading progress text doesn't resize the column
+button = ttk.Button(widgets_frame, text="Insert", width=20, command=insert_row)
 button.grid(row=4, column=0, sticky="nsew")
 
 ### separator ###
@@ -137,28 +201,117 @@ treeView.bind("<<ListboxSelect>>", lambda x: selected())
 
 
 ### attaching the excel file to the UI starts here:
-import openpyxl
+# the excel file is read on a worker thread so the UI stays responsive while
+# a big file loads. tkinter is not thread-safe, so the worker only does the
+# openpyxl part and hands the rows over through this queue as
+# ("headings", tuple), ("rows", list) batches, ("done", None) or ("error", message)
+LOAD_BATCH_SIZE = 500
+load_queue = queue.Queue()
+loaded_count = 0
+
+def read_rows(path):
+    try:
+        # read_only only streams the values we display (much faster on big files).
+        # The editable workbook is loaded separately by get_workbook() on the first insert
+        ro_workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = ro_workbook.active.values
+            headings = next(rows, None) # the first row holds the column headings
+            if headings is None:
+                raise ValueError(f"{path} is empty")
+            load_queue.put(("headings", headings))
+
+            # rows are sent in batches so they show up while the rest is still being read
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) == LOAD_BATCH_SIZE:
+                    load_queue.put(("rows", batch))
+                    batch = []
+            load_queue.put(("rows", batch))
+        finally:
+            ro_workbook.close() # read-only workbooks keep the file open until closed
+        load_queue.put(("done", None))
+    except Exception as e:
+        load_queue.put(("error", str(e))) # shown to the user by show_rows()
+
+def load_failed(message):
+    # Insert stays disabled: there is no sheet to add the rows to
+    button.config(text="Insert")
+    messagebox.showerror("Could not load excel file", message)
+
+def show_rows():
+    # handles what the worker has sent so far, inserting at most one batch per call
+    # so the window keeps redrawing and reacting between batches
+    global loaded_count
+    while True:
+        try:
+            kind, data = load_queue.get_nowait()
+        except queue.Empty:
+            root.after(50, show_rows) # still loading, check again later
+            return
+
+        if kind == "error":
+            load_failed(data)
+            return
+        if kind == "done":
+            button.config(text="Insert")
+            button.state(["!disabled"])
+            return
+
+        try:
+            if kind == "headings":
+                for col_name in data:
+                    # this loop gets the first "values" on the excel sheet (ie: headings of the columns)
+                    # those will then be set as the headings on the tkinter UI.
+                    # Only the treeView's own columns can get a heading (empty cells come as None)
+                    if col_name in cols:
+                        treeView.heading(col_name, text=col_name)
+            else:
+                insert = treeView.insert # looked up once instead of once per row
+                for value_tuple in data:
+                    # the remaining rows are the data (lists) we need loaded into the treeView
+                    insert('', tk.END, values=value_tuple)
+                loaded_count += len(data)
+                button.config(text=f"Loading... {loaded_count}") # progress (rows so far)
+                root.after(10, show_rows)
+                return
+        except Exception as e: # e.g. tk.TclError, otherwise polling would just stop
+            load_failed(str(e))
+            return
 
 def load_data():
-    # used prefix (r) to avoid unicodeescape error
-    # see https://stackoverflow.com/questions/1347791/unicode-error-unicodeescape-codec-cant-decode-bytes-cannot-open-text-file
-    # path = r"C:\Users\Administrator\Desktop\Github\xl_tkinter\people.xlsx" # windows
-    path = r"./people.xlsx" # linux
-    workbook = openpyxl.load_workbook(path)
-    sheet = workbook.active
-    list_values = list(sheet.values)
-    # print(list_values) # to see the data inside the active sheet of the excel file
-    for col_name in list_values[0]:
-        # this loop gets the first "values" on the excel sheet (ie: headings of the columns)
-        # those will then be set as the headings on the tkinter UI
-        treeView.heading(col_name, text=col_name)
-
-    for value_tuple in list_values[1:]:
-        # starting from [1] onwards, are the data (lists) we need loaded into the treeView
-        treeView.insert('', tk.END, values=value_tuple)
-
+    # no inserting until the sheet is loaded, otherwise a new row would end up
+    # above the rows of the file in the treeView
+    button.state(["disabled"])
+    button.config(text="Loading...")
+    threading.Thread(target=read_rows, args=(xl_path,), daemon=True).start()
+    root.after(50, show_rows)
+
+# the file is read in the background, so the window shows up right away
+# instead of staying blank until the whole excel file has been read
 load_data()
 ################## /TreeView / Excel LabelFrame ####################################
 
 
+### write any unsaved rows before the window closes
+def on_close():
+    global save_pending_id
+    if save_pending_id:
+        root.after_cancel(save_pending_id)
+        save_pending_id = None
+    while pending_rows:
+        try:
+            write_workbook()
+        except Exception as e:
+            # don't throw the new rows away without asking
+            answer = messagebox.askyesnocancel("Save failed", excel_error_text("save", e) +
+                "Yes: try again\nNo: close without saving the new rows\nCancel: keep the app open")
+            if answer is None:
+                return
+            if not answer:
+                break
+    root.destroy()
+
+root.protocol("WM_DELETE_WINDOW", on_close)
 root.mainloop()